@@ -24,14 +24,36 @@ from __future__ import annotations
 
 from argparse import ArgumentParser, Namespace
 from collections.abc import Sequence
-from contextlib import suppress, contextmanager
-from dataclasses import dataclass
-import filecmp
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import suppress
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import fcntl
+import grp
+import hashlib
 import json
 import logging
 import logging.handlers
-from functools import total_ordering
-from os import getenv, readlink
+import mmap
+import multiprocessing
+from functools import cache, cached_property, partial, total_ordering
+from itertools import chain, islice
+from os import (
+    chmod,
+    chown,
+    cpu_count,
+    fchmod,
+    fchown,
+    fstat,
+    fsync,
+    getenv,
+    getpid,
+    lstat,
+    readlink,
+    scandir,
+    stat_result,
+    walk,
+)
 import re
 import shlex
 import shutil
@@ -41,14 +63,21 @@ from bisect import bisect_left as bisect
 from datetime import datetime as dt, timezone
 from pathlib import Path
 from string import Template
+from queue import Empty, Queue
+from stat import S_IMODE, S_ISLNK
+from threading import Lock, Thread
 from time import perf_counter, sleep
 from typing import Iterable, Literal
 from urllib.parse import urljoin
 
 import jinja2
-import tomlkit
+import tomli_w
 import urllib3
-import zc.lockfile
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
 
 try:
     from os import EX_OK, EX_SOFTWARE as EX_FAILURE
@@ -64,6 +93,41 @@ else:
 
 HERE = Path(__file__).resolve().parent
 
+# The "language/version" pair being built, to prefix log records with.
+current_build: ContextVar[str] = ContextVar("current_build", default="")
+
+# Builders of different versions may run in parallel threads, each
+# updating the same states, and writing them to the state file.
+state_lock = Lock()
+
+# Directories of a built doc never containing HTML pages.
+SKIPPED_DIRECTORIES = frozenset({"archives", "_images", "_sources", "_static"})
+
+# Whether Doc/ or Misc/NEWS.d/ changed between two CPython commits.
+_DIFF_CACHE: dict[tuple[str, str], bool] = {}
+
+# Version branches, in the output of "git branch -r".
+_BRANCH_RE = re.compile(r"/([0-9]+\.[0-9]+)$", re.M)
+
+_CANONICAL_PREFIX = b'<link rel="canonical" href="https://docs.python.org/'
+
+
+@cache
+def jinja_environment() -> jinja2.Environment:
+    """Jinja environment for our templates, compiling each only once.
+
+    Compiled templates are also kept on disk, to be reused by the next
+    runs. Templates are not expected to change during a run, so they are
+    never checked for modifications.
+    """
+    bytecode_cache = HERE / ".jinja_cache"
+    bytecode_cache.mkdir(exist_ok=True)
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(HERE / "templates"),
+        bytecode_cache=jinja2.FileSystemBytecodeCache(bytecode_cache),
+        auto_reload=False,
+    )
+
 
 @total_ordering
 class Version:
@@ -81,6 +145,8 @@ class Version:
         "prerelease": "pre-release",
     }
 
+    __slots__ = ("name", "branch_or_tag", "status", "_tuple")
+
     def __init__(self, name, *, status, branch_or_tag=None):
         status = self.SYNONYMS.get(status, status)
         if status not in self.STATUSES:
@@ -91,6 +157,7 @@ class Version:
         self.name = name
         self.branch_or_tag = branch_or_tag
         self.status = status
+        self._tuple = version_to_tuple(name)
 
     def __repr__(self):
         return f"Version({self.name})"
@@ -126,7 +193,7 @@ class Version:
 
     def as_tuple(self):
         """This version name as tuple, for easy comparisons."""
-        return version_to_tuple(self.name)
+        return self._tuple
 
     @property
     def url(self):
@@ -172,13 +239,12 @@ class Version:
 
     def setup_indexsidebar(self, versions: Sequence[Version], dest_path: Path):
         """Build indexsidebar.html for Sphinx."""
-        template_path = HERE / "templates" / "indexsidebar.html"
-        template = jinja2.Template(template_path.read_text(encoding="UTF-8"))
+        template = jinja_environment().get_template("indexsidebar.html")
         rendered_template = template.render(
             current_version=self,
             versions=versions[::-1],
         )
-        dest_path.write_text(rendered_template, encoding="UTF-8")
+        write_if_changed(dest_path, rendered_template.encode("UTF-8"))
 
     @classmethod
     def from_json(cls, name, values):
@@ -188,8 +254,11 @@ class Version:
     def __eq__(self, other):
         return self.name == other.name
 
+    def __hash__(self):
+        return hash(self.name)
+
     def __gt__(self, other):
-        return self.as_tuple() > other.as_tuple()
+        return self._tuple > other._tuple
 
 
 @dataclass(frozen=True, order=True)
@@ -233,7 +302,7 @@ def run(cmd, cwd=None) -> subprocess.CompletedProcess:
         logging.error(
             "Run: '%s' KO:\n%s",
             cmdstring,
-            "\n".join(f"    {line}" for line in result.stdout.split("\n")[-20:]),
+            "\n".join(f"    {line}" for line in result.stdout.rsplit("\n", 20)[-20:]),
         )
     result.check_returncode()
     return result
@@ -261,23 +330,11 @@ def run_with_logging(cmd, cwd=None):
         raise subprocess.CalledProcessError(return_code, cmd[0])
 
 
-def changed_files(left, right):
-    """Compute a list of different files between left and right, recursively.
-    Resulting paths are relative to left.
-    """
-    changed = []
-
-    def traverse(dircmp_result):
-        base = Path(dircmp_result.left).relative_to(left)
-        for file in dircmp_result.diff_files:
-            changed.append(str(base / file))
-            if file == "index.html":
-                changed.append(str(base) + "/")
-        for dircomp in dircmp_result.subdirs.values():
-            traverse(dircomp)
-
-    traverse(filecmp.dircmp(left, right))
-    return changed
+def replace_replacement_characters(file: Path) -> None:
+    """Replace U+FFFD REPLACEMENT CHARACTER by '?', leaving clean files as is."""
+    content = file.read_bytes()
+    if "\N{REPLACEMENT CHARACTER}".encode() in content:
+        file.write_bytes(content.replace("\N{REPLACEMENT CHARACTER}".encode(), b"?"))
 
 
 @dataclass
@@ -286,22 +343,56 @@ class Repository:
 
     remote: str
     directory: Path
+    _head: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def run(self, *args):
         """Run git command in the clone repository."""
         return run(("git", "-C", self.directory) + args)
 
+    def head(self) -> str:
+        """Return the commit currently checked out, as of the last switch."""
+        if self._head is None:
+            self._head = self.run("rev-parse", "HEAD").stdout.strip()
+        return self._head
+
+    def differs(self, old: str, new: str, *paths: str) -> bool:
+        """Tell whether anything under the given paths changed between two commits.
+
+        Relies on the exit status of 'git diff --quiet', which stops at
+        the first difference instead of listing them all.
+        """
+        cmd = ["git", "-C", str(self.directory), "diff", "--quiet", old, new, "--"]
+        cmd += paths
+        logging.debug("Run: '%s'", shlex.join(cmd))
+        result = subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+            errors="backslashreplace",
+            check=False,
+        )
+        if result.returncode not in (0, 1):
+            logging.error("Run: '%s' KO:\n%s", shlex.join(cmd), result.stderr)
+            result.check_returncode()
+        return result.returncode == 1
+
     def get_ref(self, pattern):
-        """Return the reference of a given tag or branch."""
-        try:
-            # Maybe it's a branch
-            return self.run("show-ref", "-s", "origin/" + pattern).stdout.strip()
-        except subprocess.CalledProcessError:
-            # Maybe it's a tag
-            return self.run("show-ref", "-s", "tags/" + pattern).stdout.strip()
+        """Return the commit of a given tag or branch."""
+        # Look for a branch and a tag at once: refs are listed by name, so
+        # a branch (refs/remotes/) comes before a tag (refs/tags/).
+        refs = self.run(
+            "show-ref", "--dereference", "origin/" + pattern, "tags/" + pattern
+        )
+        refs = dict(line.split()[::-1] for line in refs.stdout.splitlines())
+        name, sha = next(iter(refs.items()))
+        # An annotated tag is listed again, as "tag^{}", peeled to its commit.
+        return refs.get(name + "^{}", sha)
 
     def fetch(self):
         """Try (and retry) to run git fetch."""
+        self._head = None
         try:
             return self.run("fetch")
         except subprocess.CalledProcessError as err:
@@ -311,7 +402,10 @@ class Repository:
 
     def switch(self, branch_or_tag):
         """Reset and cleans the repository to the given branch or tag."""
-        self.run("reset", "--hard", self.get_ref(branch_or_tag), "--")
+        self._head = None
+        commit = self.get_ref(branch_or_tag)
+        self.run("reset", "--hard", commit, "--")
+        self._head = commit
         self.run("clean", "-dfqx")
 
     def clone(self):
@@ -326,7 +420,20 @@ class Repository:
     def update(self):
         self.clone() or self.fetch()
 
+    def add_worktree(self, directory: Path) -> Repository:
+        """Maybe add a linked worktree of this repository, if not already added.
 
+        A worktree shares the objects and references of this clone, so it
+        can be switched to another branch without cloning nor fetching again.
+        """
+        if not (directory / ".git").exists():
+            logging.info("Adding worktree %s", directory)
+            self.run("worktree", "prune")
+            self.run("worktree", "add", "--detach", directory)
+        return Repository(self.remote, directory)
+
+
+@cache
 def version_to_tuple(version):
     """Transform a version string to a tuple, for easy comparisons."""
     return tuple(int(part) for part in version.split("."))
@@ -364,21 +471,18 @@ def locate_nearest_version(available_versions, target_version):
     return tuple_to_version(found)
 
 
-@contextmanager
-def edit(file: Path):
-    """Context manager to edit a file "in place", use it as:
-
-    with edit("/etc/hosts") as (i, o):
-        for line in i:
-            o.write(line.replace("localhoat", "localhost"))
-    """
-    temporary = file.with_name(file.name + ".tmp")
-    with suppress(FileNotFoundError):
-        temporary.unlink()
-    with open(file, encoding="UTF-8") as input_file:
-        with open(temporary, "w", encoding="UTF-8") as output_file:
-            yield input_file, output_file
-    temporary.rename(file)
+@cache
+def render_switchers(
+    language_pairs: tuple[tuple[str, str], ...],
+    version_pairs: tuple[tuple[str, str], ...],
+) -> str:
+    """Render switchers.js, once per run as all builds share the same pickers."""
+    switchers_template_file = HERE / "templates" / "switchers.js"
+    template = Template(switchers_template_file.read_text(encoding="UTF-8"))
+    return template.safe_substitute(
+        LANGUAGES=json.dumps(language_pairs),
+        VERSIONS=json.dumps(version_pairs),
+    )
 
 
 def setup_switchers(
@@ -388,30 +492,37 @@ def setup_switchers(
     - Cross-link various languages in a language switcher
     - Cross-link various versions in a version switcher
     """
-    language_pairs = sorted((l.tag, l.name) for l in languages if l.in_prod)
-    version_pairs = [(v.name, v.picker_label) for v in reversed(versions)]
+    language_pairs = tuple(sorted((l.tag, l.name) for l in languages if l.in_prod))
+    version_pairs = tuple((v.name, v.picker_label) for v in reversed(versions))
 
-    switchers_template_file = HERE / "templates" / "switchers.js"
     switchers_path = html_root / "_static" / "switchers.js"
-
-    template = Template(switchers_template_file.read_text(encoding="UTF-8"))
-    rendered_template = template.safe_substitute(
-        LANGUAGES=json.dumps(language_pairs),
-        VERSIONS=json.dumps(version_pairs),
+    write_if_changed(
+        switchers_path,
+        render_switchers(language_pairs, version_pairs).encode("UTF-8"),
     )
-    switchers_path.write_text(rendered_template, encoding="UTF-8")
 
-    for file in html_root.glob("**/*.html"):
+    scripts_by_depth: dict[int, bytes] = {}
+    body = b"  </body>\n"
+
+    def inject_script(file: Path):
         depth = len(file.relative_to(html_root).parts) - 1
-        src = f"{'../' * depth}_static/switchers.js"
-        script = f'    <script type="text/javascript" src="{src}"></script>\n'
-        with edit(file) as (ifile, ofile):
-            for line in ifile:
-                if line == script:
-                    continue
-                if line == "  </body>\n":
-                    ofile.write(script)
-                ofile.write(line)
+        if depth not in scripts_by_depth:
+            src = f"{'../' * depth}_static/switchers.js"
+            scripts_by_depth[depth] = (
+                f'    <script type="text/javascript" src="{src}"></script>\n'
+            ).encode()
+        script = scripts_by_depth[depth]
+        data = file.read_bytes()
+        if data.count(script) == 1 and script + body in data:
+            return  # Already in place, leave the file (and its mtime) alone.
+        new_data = data.replace(script, b"").replace(body, script + body)
+        if new_data != data:
+            file.write_bytes(new_data)
+
+    # Rewriting files is I/O bound, so threads are enough to spread it.
+    with ThreadPoolExecutor(max_workers=min(32, (cpu_count() or 1) * 4)) as executor:
+        for _ in executor.map(inject_script, html_root.glob("**/*.html")):
+            pass
 
 
 def copy_robots_txt(
@@ -427,9 +538,11 @@ def copy_robots_txt(
     logging.info("Copying robots.txt...")
     template_path = HERE / "templates" / "robots.txt"
     robots_path = www_root / "robots.txt"
-    shutil.copyfile(template_path, robots_path)
+    if not write_if_changed(robots_path, template_path.read_bytes()):
+        logging.info("robots.txt is up to date.")
+        return
     robots_path.chmod(0o775)
-    run(["chgrp", group, robots_path])
+    chgrp(robots_path, group)
     if not skip_cache_invalidation:
         purge(http, "robots.txt")
 
@@ -442,13 +555,13 @@ def build_sitemap(
         logging.info("Skipping sitemap generation (www root does not even exist).")
         return
     logging.info("Starting sitemap generation...")
-    template_path = HERE / "templates" / "sitemap.xml"
-    template = jinja2.Template(template_path.read_text(encoding="UTF-8"))
+    template = jinja_environment().get_template("sitemap.xml")
     rendered_template = template.render(languages=languages, versions=versions)
     sitemap_path = www_root / "sitemap.xml"
-    sitemap_path.write_text(rendered_template + "\n", encoding="UTF-8")
+    if not write_if_changed(sitemap_path, (rendered_template + "\n").encode("UTF-8")):
+        return
     sitemap_path.chmod(0o664)
-    run(["chgrp", group, sitemap_path])
+    chgrp(sitemap_path, group)
 
 
 def build_404(www_root: Path, group):
@@ -458,9 +571,107 @@ def build_404(www_root: Path, group):
         return
     logging.info("Copying 404 page...")
     not_found_file = www_root / "404.html"
-    shutil.copyfile(HERE / "templates" / "404.html", not_found_file)
+    if not write_if_changed(
+        not_found_file, (HERE / "templates" / "404.html").read_bytes()
+    ):
+        return
     not_found_file.chmod(0o664)
-    run(["chgrp", group, not_found_file])
+    chgrp(not_found_file, group)
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Write data to path unless it already holds exactly that.
+
+    Returns whether the file was written, so callers can skip fixing
+    permissions or purging the CDN for an untouched file.
+    """
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def replace_file(path: Path, data: bytes, like: stat_result | None = None) -> None:
+    """Write data to path atomically, through a temporary file.
+
+    Readers, even from other processes, get either the previous or the
+    new content, never a partially written file. If given, the mode and
+    group of the new file are taken from the stat result like.
+    """
+    temporary = path.with_name(f".{path.name}.{getpid()}.tmp")
+    try:
+        with open(temporary, "wb") as file:
+            file.write(data)
+            if like is not None:
+                fchmod(file.fileno(), S_IMODE(like.st_mode))
+                fchown(file.fileno(), -1, like.st_gid)
+            # Don't replace the file before its new content is on disk.
+            file.flush()
+            fsync(file.fileno())
+        temporary.replace(path)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+
+
+def chgrp(path: Path, group: str, follow_symlinks: bool = True) -> None:
+    """Like the chgrp command, without spawning it."""
+    chown(path, -1, group_id(group), follow_symlinks=follow_symlinks)
+
+
+def rsync_changed_files(itemized: str) -> list[str]:
+    """List the files rsync copied or deleted, from its "%i %n" output.
+
+    Directories and links rsync only touched are left out, and so are
+    its warnings, as run() mixes them in the output.
+    """
+    changed = []
+    for line in itemized.splitlines():
+        changes, _, file = line.partition(" ")
+        if changes == "*deleting":
+            file = file.lstrip(" ")  # Padded to the width of the changes.
+            if not file.endswith("/"):
+                changed.append(file)
+        elif changes.startswith(">f"):
+            changed.append(file)
+    return changed
+
+
+def make_readable(directory: Path, group: str) -> None:
+    """Give a tree to the group, and make it readable by others.
+
+    Like 'chown -R :group' followed by 'chmod -R o+r' (and o+x on
+    directories), in a single walk and without spawning processes.
+    Symlinks are left as is.
+    """
+    gid = group_id(group)
+    for dirpath, _, filenames in walk(directory, onerror=_raise):
+        chown(dirpath, -1, gid)
+        chmod(dirpath, S_IMODE(lstat(dirpath).st_mode) | 0o005)
+        for filename in filenames:
+            path = Path(dirpath, filename)
+            mode = lstat(path).st_mode
+            if S_ISLNK(mode):
+                continue
+            chown(path, -1, gid)
+            chmod(path, S_IMODE(mode) | 0o004)
+
+
+def _raise(error: OSError) -> None:
+    # Don't let os.walk skip directories it can't list.
+    raise error
+
+
+@cache
+def group_id(group: str) -> int:
+    """Find the id of a group given by name, or already by id."""
+    try:
+        return grp.getgrnam(group).gr_gid
+    except KeyError:
+        return int(group)
 
 
 def head(text, lines=10):
@@ -560,6 +771,20 @@ def parse_args():
         "Builds all available languages by default.",
         metavar="fr",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of versions to build in parallel, "
+        "each in its own git worktree (defaults to 1).",
+    )
+    parser.add_argument(
+        "--jobs",
+        default="auto",
+        help="Number of processes sphinx-build uses, for versions 3.10 and"
+        " later, like its -j option: a number, or 'auto' for one per CPU"
+        " (defaults to auto). Use 1 to debug a build.",
+    )
     parser.add_argument(
         "--version",
         action="store_true",
@@ -572,6 +797,8 @@ def parse_args():
         " --theme git+https://github.com/obulat/python-docs-theme@master",
     )
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1.")
     if args.version:
         version_info()
         sys.exit(0)
@@ -587,9 +814,9 @@ def parse_args():
 
 def setup_logging(log_directory: Path, select_output: str | None):
     """Setup logging to stderr if run by a human, or to a file if run from a cron."""
-    log_format = "%(asctime)s %(levelname)s: %(message)s"
+    log_format = "%(asctime)s %(levelname)s%(current_build)s: %(message)s"
     if sys.stderr.isatty():
-        logging.basicConfig(format=log_format, stream=sys.stderr)
+        handler = logging.StreamHandler(sys.stderr)
     else:
         log_directory.mkdir(parents=True, exist_ok=True)
         if select_output is None:
@@ -597,11 +824,19 @@ def setup_logging(log_directory: Path, select_output: str | None):
         else:
             filename = log_directory / f"docsbuild-{select_output}.log"
         handler = logging.handlers.WatchedFileHandler(filename)
-        handler.setFormatter(logging.Formatter(log_format))
-        logging.getLogger().addHandler(handler)
+    handler.setFormatter(logging.Formatter(log_format))
+    handler.addFilter(add_current_build)
+    logging.getLogger().addHandler(handler)
     logging.getLogger().setLevel(logging.DEBUG)
 
 
+def add_current_build(record: logging.LogRecord) -> bool:
+    """Logging filter prefixing records with the build of the current thread."""
+    build = current_build.get()
+    record.current_build = f" {build}" if build else ""
+    return True
+
+
 @dataclass
 class DocBuilder:
     """Builder for a CPython version and a language."""
@@ -619,6 +854,9 @@ class DocBuilder:
     log_directory: Path
     skip_cache_invalidation: bool
     theme: Path
+    jobs: str
+    purger: SurrogateKeyPurger
+    states: dict
 
     @property
     def html_only(self):
@@ -633,7 +871,7 @@ class DocBuilder:
         """Does the build we are running include HTML output?"""
         return self.select_output != "no-html"
 
-    def run(self, http: urllib3.PoolManager) -> bool:
+    def run(self) -> bool:
         """Build and publish a Python doc, for a language, and a version."""
         start_time = perf_counter()
         start_timestamp = dt.now(tz=timezone.utc).replace(microsecond=0)
@@ -648,7 +886,7 @@ class DocBuilder:
             if trigger_reason := self.should_rebuild():
                 self.build_venv()
                 self.build()
-                self.copy_build_to_webroot(http)
+                self.copy_build_to_webroot()
                 self.save_state(
                     build_start=start_timestamp,
                     build_duration=perf_counter() - start_time,
@@ -664,13 +902,13 @@ class DocBuilder:
     @property
     def checkout(self) -> Path:
         """Path to CPython git clone."""
-        return self.build_root / _checkout_name(self.select_output)
+        return self.cpython_repo.directory
 
     def clone_translation(self):
         self.translation_repo.update()
         self.translation_repo.switch(self.translation_branch)
 
-    @property
+    @cached_property
     def translation_repo(self):
         """See PEP 545 for translations repository naming convention."""
 
@@ -695,7 +933,7 @@ class DocBuilder:
         It could be enhanced to also search for tags.
         """
         remote_branches = self.translation_repo.run("branch", "-r").stdout
-        branches = re.findall(r"/([0-9]+\.[0-9]+)$", remote_branches, re.M)
+        branches = _BRANCH_RE.findall(remote_branches)
         return locate_nearest_version(branches, self.version.name)
 
     def build(self):
@@ -718,19 +956,19 @@ class DocBuilder:
             # Luatex already fixed this issue, so we can remove this once Texlive
             # is updated.
             # (https://github.com/TeX-Live/luatex/commit/af5faf1)
-            subprocess.check_output(
-                "sed -i s/\N{REPLACEMENT CHARACTER}/?/g "
-                f"{locale_dirs}/ja/LC_MESSAGES/**/*.po",
-                shell=True,
-            )
-            subprocess.check_output(
-                "sed -i s/\N{REPLACEMENT CHARACTER}/?/g "
-                f"{self.checkout}/Doc/**/*.rst",
-                shell=True,
+            files = chain(
+                (locale_dirs / "ja" / "LC_MESSAGES").rglob("*.po"),
+                (self.checkout / "Doc").rglob("*.rst"),
             )
+            with ThreadPoolExecutor() as executor:
+                for _ in executor.map(replace_replacement_characters, files):
+                    pass
 
         if self.version.status == "EOL":
             sphinxopts.append("-D html_context.outdated=1")
+        if self.version.as_tuple() >= (3, 10):
+            # Older branches use extensions which are not parallel safe.
+            sphinxopts.append(f"-j {self.jobs}")
 
         if self.version.status in ("in development", "pre-release"):
             maketarget = "autobuild-dev"
@@ -781,20 +1019,45 @@ class DocBuilder:
 
         So we can reuse them from builds to builds, while they contain
         different Sphinx versions.
+
+        Dependencies are upgraded at most once a day, unless the
+        requirements change, so all languages of a version share the
+        same install.
         """
         venv_path = self.build_root / ("venv-" + self.version.name)
+        fingerprint = hashlib.sha256()
+        for requirement in [
+            dt.now(tz=timezone.utc).date().isoformat(),
+            sys.executable,
+            str(self.theme),
+            *self.version.requirements,
+        ]:
+            fingerprint.update(requirement.encode() + b"\0")
+            if requirement.startswith("-r"):
+                with suppress(FileNotFoundError):
+                    requirements_file = self.checkout / "Doc" / requirement[2:]
+                    fingerprint.update(requirements_file.read_bytes())
+        stamp = venv_path / "requirements.sha256"
+        with suppress(FileNotFoundError):
+            if stamp.read_text(encoding="UTF-8") == fingerprint.hexdigest():
+                logging.info("Reusing venv %s.", venv_path)
+                self.venv = venv_path
+                return
         run([sys.executable, "-m", "venv", venv_path])
         run(
             [venv_path / "bin" / "python", "-m", "pip", "install", "--upgrade"]
             + ["--upgrade-strategy=eager"]
+            # Byte-compile lazily, only the modules a build imports.
+            + ["--no-compile"]
             + [self.theme]
             + self.version.requirements,
             cwd=self.checkout / "Doc",
         )
         run([venv_path / "bin" / "python", "-m", "pip", "freeze", "--all"])
+        stamp.write_text(fingerprint.hexdigest(), encoding="UTF-8")
         self.venv = venv_path
 
-    def copy_build_to_webroot(self, http: urllib3.PoolManager) -> None:
+    def copy_build_to_webroot(self) -> None:
         """Copy a given build to the appropriate webroot with appropriate rights."""
         logging.info("Publishing start.")
         start_time = perf_counter()
@@ -805,8 +1068,8 @@ class DocBuilder:
             language_dir = self.www_root / self.language.tag
             language_dir.mkdir(parents=True, exist_ok=True)
             try:
-                run(["chgrp", "-R", self.group, language_dir])
-            except subprocess.CalledProcessError as err:
+                chgrp(language_dir, self.group)
+            except OSError as err:
                 logging.warning("Can't change group of %s: %s", language_dir, str(err))
             language_dir.chmod(0o775)
             target = language_dir / self.version.name
@@ -816,87 +1079,54 @@ class DocBuilder:
             target.chmod(0o775)
         except PermissionError as err:
             logging.warning("Can't change mod of %s: %s", target, str(err))
-        try:
-            run(["chgrp", "-R", self.group, target])
-        except subprocess.CalledProcessError as err:
-            logging.warning("Can't change group of %s: %s", target, str(err))
 
         changed = []
         if self.includes_html:
             # Copy built HTML files to webroot (default /srv/docs.python.org)
-            changed = changed_files(self.checkout / "Doc" / "build" / "html", target)
             logging.info("Copying HTML files to %s", target)
-            run(
-                [
-                    "chown",
-                    "-R",
-                    ":" + self.group,
-                    self.checkout / "Doc" / "build" / "html/",
-                ]
-            )
-            run(["chmod", "-R", "o+r", self.checkout / "Doc" / "build" / "html"])
-            run(
-                [
-                    "find",
-                    self.checkout / "Doc" / "build" / "html",
-                    "-type",
-                    "d",
-                    "-exec",
-                    "chmod",
-                    "o+x",
-                    "{}",
-                    ";",
-                ]
-            )
-            run(
+            make_readable(self.checkout / "Doc" / "build" / "html", self.group)
+            # Compare checksums, as a fresh build has only new mtimes,
+            # and let rsync tell which files it had to copy or delete.
+            itemized = run(
                 [
                     "rsync",
                     "-a",
+                    "--checksum",
+                    "--out-format=%i %n",
                     "--delete-delay",
                     "--filter",
                     "P archives/",
                     str(self.checkout / "Doc" / "build" / "html") + "/",
                     target,
                 ]
-            )
+            ).stdout
+            for file in rsync_changed_files(itemized):
+                changed.append(file)
+                if Path(file).name == "index.html":
+                    changed.append(str(Path(file).parent) + "/")
 
         if not self.quick:
             # Copy archive files to /archives/
             logging.debug("Copying dist files.")
-            run(
-                [
-                    "chown",
-                    "-R",
-                    ":" + self.group,
-                    self.checkout / "Doc" / "dist",
-                ]
-            )
-            run(
-                [
-                    "chmod",
-                    "-R",
-                    "o+r",
-                    self.checkout / "Doc" / "dist",
-                ]
-            )
+            make_readable(self.checkout / "Doc" / "dist", self.group)
             run(["mkdir", "-m", "o+rx", "-p", target / "archives"])
-            run(["chown", ":" + self.group, target / "archives"])
-            run(
-                [
-                    "cp",
-                    "-a",
-                    *(self.checkout / "Doc" / "dist").glob("*"),
-                    target / "archives",
-                ]
-            )
+            for dist in (self.checkout / "Doc" / "dist").iterdir():
+                # copy2 lets the kernel copy the data, and keeps mode and mtime.
+                shutil.copy2(dist, target / "archives" / dist.name)
             changed.append("archives/")
             for file in (target / "archives").iterdir():
                 changed.append("archives/" + file.name)
 
+        # Once, for all copied files and whatever was already published.
+        try:
+            run(["chown", "-R", ":" + self.group, target])
+        except subprocess.CalledProcessError as err:
+            logging.warning("Can't change group of %s: %s", target, str(err))
+
         logging.info("%s files changed", len(changed))
         if changed and not self.skip_cache_invalidation:
             surrogate_key = f"{self.language.tag}/{self.version.name}"
-            purge_surrogate_key(http, surrogate_key)
+            self.purger.purge(surrogate_key)
         logging.info(
             "Publishing done (%s).", format_seconds(perf_counter() - start_time)
         )
@@ -906,11 +1136,9 @@ class DocBuilder:
         if not state:
             logging.info("Should rebuild: no previous state found.")
             return "no previous state"
-        cpython_sha = self.cpython_repo.run("rev-parse", "HEAD").stdout.strip()
+        cpython_sha = self.cpython_repo.head()
         if self.language.tag != "en":
-            translation_sha = self.translation_repo.run(
-                "rev-parse", "HEAD"
-            ).stdout.strip()
+            translation_sha = self.translation_repo.head()
             if translation_sha != state["translation_sha"]:
                 logging.info(
                     "Should rebuild: new translations (from %s to %s)",
@@ -919,10 +1147,13 @@ class DocBuilder:
                 )
                 return "new translations"
         if cpython_sha != state["cpython_sha"]:
-            diff = self.cpython_repo.run(
-                "diff", "--name-only", state["cpython_sha"], cpython_sha
-            ).stdout
-            if "Doc/" in diff or "Misc/NEWS.d/" in diff:
+            # All languages of a version usually compare the same commits.
+            key = (state["cpython_sha"], cpython_sha)
+            if key not in _DIFF_CACHE:
+                _DIFF_CACHE[key] = self.cpython_repo.differs(
+                    state["cpython_sha"], cpython_sha, "Doc/", "Misc/NEWS.d/"
+                )
+            if _DIFF_CACHE[key]:
                 logging.info(
                     "Should rebuild: Doc/ has changed (from %s to %s)",
                     state["cpython_sha"],
@@ -933,48 +1164,36 @@ class DocBuilder:
         return False
 
     def load_state(self) -> dict:
-        if self.select_output is not None:
-            state_file = self.build_root / f"state-{self.select_output}.toml"
-        else:
-            state_file = self.build_root / "state.toml"
-        try:
-            return tomlkit.loads(state_file.read_text(encoding="UTF-8"))[
-                f"/{self.language.tag}/{self.version.name}/"
-            ]
-        except (KeyError, FileNotFoundError):
-            return {}
+        return self.states.get(f"/{self.language.tag}/{self.version.name}/", {})
 
     def save_state(self, build_start: dt, build_duration: float, trigger: str):
         """Save current CPython sha1 and current translation sha1.
 
         Using this we can deduce if a rebuild is needed or not.
         """
-        if self.select_output is not None:
-            state_file = self.build_root / f"state-{self.select_output}.toml"
-        else:
-            state_file = self.build_root / "state.toml"
-        try:
-            states = tomlkit.parse(state_file.read_text(encoding="UTF-8"))
-        except FileNotFoundError:
-            states = tomlkit.document()
-
         key = f"/{self.language.tag}/{self.version.name}/"
         state = {
             "last_build_start": build_start,
             "last_build_duration": round(build_duration, 0),
             "triggered_by": trigger,
-            "cpython_sha": self.cpython_repo.run("rev-parse", "HEAD").stdout.strip(),
+            "cpython_sha": self.cpython_repo.head(),
         }
         if self.language.tag != "en":
-            state["translation_sha"] = self.translation_repo.run(
-                "rev-parse", "HEAD"
-            ).stdout.strip()
-        states[key] = state
-        state_file.write_text(tomlkit.dumps(states), encoding="UTF-8")
+            state["translation_sha"] = self.translation_repo.head()
+        with state_lock:
+            self.states[key] = state
+            # Replace the file atomically, so a crash mid-write can't
+            # lose the states of all the other builds.
+            replace_file(
+                _state_file(self.build_root, self.select_output),
+                tomli_w.dumps(self.states).encode(),
+            )
 
-        table = tomlkit.inline_table()
-        table |= state
-        logging.info("Saved new rebuild state for %s: %s", key, table.as_string())
+        # As a TOML inline table, for check_times.py to parse it back.
+        table = ", ".join(
+            tomli_w.dumps({name: value}).strip() for name, value in state.items()
+        )
+        logging.info("Saved new rebuild state for %s: {%s}", key, table)
 
 
 def symlink(
@@ -982,28 +1201,39 @@ def symlink(
     language: Language,
     directory: str,
     name: str,
-    group: str,
-    skip_cache_invalidation: bool,
-    http: urllib3.PoolManager,
-) -> None:
-    """Used by major_symlinks and dev_symlink to maintain symlinks."""
+) -> tuple[str, Path | None] | None:
+    """Used by major_symlinks and dev_symlink to maintain symlinks.
+
+    Returns None if the linked doc is not built yet. Else returns the
+    surrogate key of the link, and the link if it had to be created or
+    updated.
+    """
     if language.tag == "en":  # English is rooted on /, no /en/
         path = www_root
     else:
         path = www_root / language.tag
     link = path / name
-    directory_path = path / directory
-    if not directory_path.exists():
-        return  # No touching link, dest doc not built yet.
-
-    if not link.exists() or readlink(link) != directory:
-        # Link does not exist or points to the wrong target.
-        link.unlink(missing_ok=True)
-        link.symlink_to(directory)
-        run(["chown", "-h", f":{group}", str(link)])
-    if not skip_cache_invalidation:
-        surrogate_key = f"{language.tag}/{name}"
-        purge_surrogate_key(http, surrogate_key)
+    surrogate_key = f"{language.tag}/{name}"
+    try:
+        if readlink(link) == directory:
+            return surrogate_key, None
+    except OSError:  # Link does not exist (or is not a link).
+        pass
+    if not (path / directory).exists():
+        return None  # No touching link, dest doc not built yet.
+    # Link does not exist or points to the wrong target: swap in a new one
+    # atomically, so the link never goes missing while being served.
+    # Concurrent builders maintain the same links: each needs its own
+    # temporary link.
+    new_link = path / f".{name}.{getpid()}.tmp"
+    new_link.unlink(missing_ok=True)
+    new_link.symlink_to(directory)
+    try:
+        new_link.replace(link)
+    except OSError:
+        new_link.unlink(missing_ok=True)
+        raise
+    return surrogate_key, link
 
 
 def major_symlinks(
@@ -1023,17 +1253,11 @@ def major_symlinks(
     """
     logging.info("Creating major version symlinks...")
     current_stable = Version.current_stable(versions).name
+    links = []
     for language in languages:
-        symlink(
-            www_root,
-            language,
-            current_stable,
-            "3",
-            group,
-            skip_cache_invalidation,
-            http,
-        )
-        symlink(www_root, language, "2.7", "2", group, skip_cache_invalidation, http)
+        links.append(symlink(www_root, language, current_stable, "3"))
+        links.append(symlink(www_root, language, "2.7", "2"))
+    finish_symlinks(links, group, skip_cache_invalidation, http)
 
 
 def dev_symlink(
@@ -1053,16 +1277,23 @@ def dev_symlink(
     """
     logging.info("Creating development version symlinks...")
     current_dev = Version.current_dev(versions).name
-    for language in languages:
-        symlink(
-            www_root,
-            language,
-            current_dev,
-            "dev",
-            group,
-            skip_cache_invalidation,
-            http,
-        )
+    links = [symlink(www_root, language, current_dev, "dev") for language in languages]
+    finish_symlinks(links, group, skip_cache_invalidation, http)
+
+
+def finish_symlinks(
+    links: Iterable[tuple[str, Path | None] | None],
+    group: str,
+    skip_cache_invalidation: bool,
+    http: urllib3.PoolManager,
+) -> None:
+    """Fix the group of the updated links, then purge them."""
+    links = [link for link in links if link is not None]
+    for _, path in links:
+        if path is not None:
+            chgrp(path, group, follow_symlinks=False)
+    if not skip_cache_invalidation and links:
+        purge_surrogate_key(http, *(surrogate_key for surrogate_key, _ in links))
 
 
 def purge(http: urllib3.PoolManager, *paths: Path | str) -> None:
@@ -1071,35 +1302,115 @@ def purge(http: urllib3.PoolManager, *paths: Path | str) -> None:
     To be used when a file changes, so the CDN fetches the new one.
     """
     base = "https://docs.python.org/"
-    for path in paths:
-        url = urljoin(base, str(path))
+
+    def purge_one(url: str) -> None:
         logging.debug("Purging %s from CDN", url)
         http.request("PURGE", url, timeout=30)
 
+    # Each URL only needs purging once, even if given several times.
+    urls = dict.fromkeys(urljoin(base, str(path)) for path in paths)
+    # Overlap requests, on as many kept-alive connections as the pool holds.
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for _ in executor.map(purge_one, urls):
+            pass
 
-def purge_surrogate_key(http: urllib3.PoolManager, surrogate_key: str) -> None:
+
+def purge_surrogate_key(http: urllib3.PoolManager, *surrogate_keys: str) -> None:
     """Remove paths from docs.python.org's CDN.
 
-    All paths matching the given 'Surrogate-Key' will be removed.
+    All paths matching one of the given 'Surrogate-Key' will be removed.
     This is set by the Nginx server for every language-version pair.
     To be used when a directory changes, so the CDN fetches the new one.
 
-    https://www.fastly.com/documentation/reference/api/purging/#purge-tag
+    Keys are purged together, up to 256 per request.
+
+    https://www.fastly.com/documentation/reference/api/purging/#bulk-purge-tag
     """
     service_id = getenv("FASTLY_SERVICE_ID", "__UNSET__")
     fastly_key = getenv("FASTLY_TOKEN", "__UNSET__")
 
-    logging.info("Purging Surrogate-Key '%s' from CDN", surrogate_key)
-    http.request(
-        "POST",
-        f"https://api.fastly.com/service/{service_id}/purge/{surrogate_key}",
-        headers={"Fastly-Key": fastly_key},
-        timeout=30,
-    )
+    for start in range(0, len(surrogate_keys), 256):
+        batch = " ".join(surrogate_keys[start : start + 256])
+        logging.info("Purging Surrogate-Key '%s' from CDN", batch)
+        http.request(
+            "POST",
+            f"https://api.fastly.com/service/{service_id}/purge",
+            headers={"Fastly-Key": fastly_key, "Surrogate-Key": batch},
+            timeout=30,
+        )
+
+
+def iter_html(directory: Path) -> Iterable[Path]:
+    """Recursively yield HTML files from directory, like glob("**/*.html").
+
+    Directories known to never contain HTML pages (see SKIPPED_DIRECTORIES)
+    are pruned without being scanned.
+    """
+    stack = [directory]
+    while stack:
+        try:
+            entries = scandir(stack.pop())
+        except FileNotFoundError:
+            continue  # Like glob(), yield nothing from missing directories.
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIPPED_DIRECTORIES:
+                        stack.append(Path(entry.path))
+                elif entry.name.endswith(".html"):
+                    yield Path(entry.path)
+
+
+class SurrogateKeyPurger(Thread):
+    """Purge surrogate keys from the CDN in the background.
+
+    So builds don't have to wait for the CDN before going on with the
+    next one. Use close() to wait for the queued purges to be done.
+    """
+
+    def __init__(self, http: urllib3.PoolManager):
+        super().__init__(name="purger", daemon=True)
+        self.http = http
+        self.queue: Queue[str | None] = Queue()
+
+    def purge(self, surrogate_key: str) -> None:
+        self.queue.put(surrogate_key)
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.join()
+
+    def run(self) -> None:
+        closed = False
+        while not closed:
+            # Wait for a key, then purge it along with those queued meanwhile.
+            surrogate_keys = []
+            surrogate_key = self.queue.get()
+            while surrogate_key is not None:
+                surrogate_keys.append(surrogate_key)
+                try:
+                    surrogate_key = self.queue.get_nowait()
+                except Empty:
+                    break
+            else:
+                closed = True
+            if not surrogate_keys:
+                continue
+            try:
+                purge_surrogate_key(self.http, *surrogate_keys)
+            except Exception as err:
+                logging.exception(
+                    "Failed purging Surrogate-Key '%s'", " ".join(surrogate_keys)
+                )
+                if sentry_sdk:
+                    sentry_sdk.capture_exception(err)
 
 
 def proofread_canonicals(
-    www_root: Path, skip_cache_invalidation: bool, http: urllib3.PoolManager
+    www_root: Path,
+    index_file: Path,
+    skip_cache_invalidation: bool,
+    http: urllib3.PoolManager,
 ) -> None:
     """In www_root we check that all canonical links point to existing contents.
 
@@ -1107,40 +1418,185 @@ def proofread_canonicals(
 
     - /3.11/whatsnew/3.11.html typically would link to
     /3/whatsnew/3.11.html, which may not exist yet.
+
+    The canonical link of each page is kept in index_file, so pages left
+    untouched since the previous run are not read again: only their
+    link target is checked.
     """
     logging.info("Checking canonical links...")
-    canonical_re = re.compile(
-        """<link rel="canonical" href="https://docs.python.org/([^"]*)" />"""
+    try:
+        index = json.loads(index_file.read_bytes())
+    except (FileNotFoundError, ValueError):
+        index = {}
+    if index.get("www_root") != str(www_root):
+        index = {}
+    known = index.get("files", {})
+    files_index = {}
+    stats = {}  # Of the pages to read, as found before reading them.
+
+    def needs_reading(file: Path) -> bool:
+        path = str(file.relative_to(www_root))
+        stat = file.stat()
+        if path in known:
+            mtime_ns, size, target = known[path]
+            if (mtime_ns, size) == (stat.st_mtime_ns, stat.st_size) and (
+                target is None or _target_exists(www_root, target)
+            ):
+                files_index[path] = known[path]
+                return False
+        stats[file] = stat
+        return True
+
+    files = filter(needs_reading, iter_html(www_root))
+    # Reading and searching pages is CPU bound: use all cores, with tasks
+    # large enough to make up for sending them to worker processes.
+    # Chunks are sent as soon as found, while the tree is still walked.
+    chunks = iter(lambda: list(islice(files, 256)), [])
+    paths_to_purge = []
+    # Don't fork this process: sentry_sdk runs threads in it.
+    with ProcessPoolExecutor(
+        mp_context=multiprocessing.get_context("forkserver")
+    ) as executor:
+        for results in executor.map(partial(fix_canonicals, www_root), chunks):
+            for file, target, fixed in results:
+                stat = stats.pop(file)
+                if fixed:
+                    logging.info(
+                        "Removing broken canonical from %s to %s", file, target
+                    )
+                    paths_to_purge.append(file.relative_to(www_root))
+                    target = None
+                    stat = file.stat()  # The page was just rewritten.
+                files_index[str(file.relative_to(www_root))] = [
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    target,
+                ]
+    _target_exists.cache_clear()
+    replace_file(
+        index_file,
+        json.dumps({"www_root": str(www_root), "files": files_index}).encode(),
     )
-    for file in www_root.glob("**/*.html"):
-        html = file.read_text(encoding="UTF-8", errors="surrogateescape")
-        canonical = canonical_re.search(html)
-        if not canonical:
-            continue
-        target = canonical.group(1)
-        if not (www_root / target).exists():
-            logging.info("Removing broken canonical from %s to %s", file, target)
-            html = html.replace(canonical.group(0), "")
-            file.write_text(html, encoding="UTF-8", errors="surrogateescape")
-            if not skip_cache_invalidation:
-                purge(http, str(file).replace("/srv/docs.python.org/", ""))
-
-
-def parse_versions_from_devguide(http: urllib3.PoolManager) -> list[Version]:
-    releases = http.request(
+    if not skip_cache_invalidation:
+        # Purge whole builds at once, rather than each page on its own.
+        surrogate_keys = {surrogate_key_of(path) for path in paths_to_purge}
+        surrogate_keys.discard(None)
+        if surrogate_keys:
+            purge_surrogate_key(http, *sorted(surrogate_keys))
+        purge(http, *(path for path in paths_to_purge if not surrogate_key_of(path)))
+
+
+def surrogate_key_of(path: Path) -> str | None:
+    """The "language/version" surrogate key of a path relative to www_root.
+
+    Returns None for paths out of any build.
+    """
+    parts = path.parts
+    if len(parts) > 1 and re.fullmatch(r"[0-9]+\.[0-9]+", parts[0]):
+        return f"en/{parts[0]}"  # English is rooted on /, no /en/
+    if len(parts) > 2 and re.fullmatch(r"[0-9]+\.[0-9]+", parts[1]):
+        return f"{parts[0]}/{parts[1]}"
+    return None
+
+
+def fix_canonicals(
+    www_root: Path, files: list[Path]
+) -> list[tuple[Path, str | None, bool]]:
+    """Remove canonical links to missing pages, for proofread_canonicals.
+
+    Returns, for each file, the target of its canonical link (if any),
+    and whether the link was removed.
+    """
+    return [(file, *fix_canonical(www_root, file)) for file in files]
+
+
+def fix_canonical(www_root: Path, file: Path) -> tuple[str | None, bool]:
+    """Remove the canonical link of a file, if it points to a missing page."""
+    with open(file, "rb") as html_file:
+        stat = fstat(html_file.fileno())
+        if not stat.st_size:
+            return None, False  # Empty files can't be mapped.
+        # Search the page cache directly: most pages are left untouched.
+        with mmap.mmap(html_file.fileno(), 0, access=mmap.ACCESS_READ) as html:
+            # Plain searches, way faster than a regex on large pages, and
+            # bounded to the <head> so pages without a link stop early.
+            head_end = html.find(b"</head>")
+            if head_end == -1:
+                head_end = len(html)
+            start = html.find(_CANONICAL_PREFIX, 0, head_end)
+            if start == -1:
+                return None, False
+            quote = html.find(b'"', start + len(_CANONICAL_PREFIX))
+            if quote == -1 or html[quote : quote + 4] != b'" />':
+                return None, False
+            target = html[start + len(_CANONICAL_PREFIX) : quote].decode(
+                "UTF-8", errors="surrogateescape"
+            )
+            if _target_exists(www_root, target):
+                return target, False
+            data = html[:start] + html[quote + 4 :]
+    # Concurrent builders may proofread the same page: never rewrite it in
+    # place, so each of them gets a whole page to read and fix.
+    try:
+        replace_file(file, data, like=stat)
+    except OSError as err:
+        logging.warning("Can't remove canonical link from %s: %s", file, err)
+        return target, False
+    return target, True
+
+
+@cache
+def _target_exists(www_root: Path, target: str) -> bool:
+    # Pages of all versions of a language share the same canonical links.
+    # Each worker process of proofread_canonicals has its own cache, which
+    # goes away with it.
+    return (www_root / target).exists()
+
+
+def parse_versions_from_devguide(
+    http: urllib3.PoolManager, cache_directory: Path | None = None
+) -> list[Version]:
+    """Read the devguide release cycle to discover versions to build.
+
+    If cache_directory is given, the release cycle is kept there along
+    with its ETag, so it is only downloaded again once it changed.
+    """
+    headers = {"Accept-Encoding": "gzip"}
+    if cache_directory is not None:
+        cache_file = cache_directory / "release-cycle.json"
+        etag_file = cache_directory / "release-cycle.json.etag"
+        if cache_file.exists() and etag_file.exists():
+            headers["If-None-Match"] = etag_file.read_text(encoding="UTF-8")
+    response = http.request(
         "GET",
         "https://raw.githubusercontent.com/"
         "python/devguide/main/include/release-cycle.json",
+        headers=headers,
         timeout=30,
-    ).json()
+    )
+    if response.status == 304:
+        logging.debug("Using cached release cycle from %s", cache_file)
+        releases = json.loads(cache_file.read_bytes())
+    else:
+        releases = json.loads(response.data)
+        if cache_directory is not None and (etag := response.headers.get("ETag")):
+            cache_directory.mkdir(parents=True, exist_ok=True)
+            # Concurrent builders share the cache: never let them read it
+            # half written.
+            replace_file(cache_file, response.data)
+            replace_file(etag_file, etag.encode("UTF-8"))
     versions = [Version.from_json(name, release) for name, release in releases.items()]
     versions.sort(key=Version.as_tuple)
     return versions
 
 
+@cache
 def parse_languages_from_config() -> list[Language]:
-    """Read config.toml to discover languages to build."""
-    config = tomlkit.parse((HERE / "config.toml").read_text(encoding="UTF-8"))
+    """Read config.toml to discover languages to build.
+
+    The file is only read and parsed once per process.
+    """
+    config = tomllib.loads((HERE / "config.toml").read_text(encoding="UTF-8"))
     languages = []
     defaults = config["defaults"]
     for iso639_tag, section in config["languages"].items():
@@ -1149,7 +1605,7 @@ def parse_languages_from_config() -> list[Language]:
                 iso639_tag,
                 section["name"],
                 section.get("in_prod", defaults["in_prod"]),
-                sphinxopts=section.get("sphinxopts", defaults["sphinxopts"]),
+                sphinxopts=tuple(section.get("sphinxopts", defaults["sphinxopts"])),
                 html_only=section.get("html_only", defaults["html_only"]),
             )
         )
@@ -1174,43 +1630,86 @@ def build_docs(args) -> bool:
     """Build all docs (each language and each version)."""
     logging.info("Full build start.")
     start_time = perf_counter()
-    http = urllib3.PoolManager()
-    versions = parse_versions_from_devguide(http)
+    # Purges are sent from concurrent threads, let them all keep a connection.
+    http = urllib3.PoolManager(maxsize=16, block=False)
+    versions = parse_versions_from_devguide(http, args.build_root)
     languages = parse_languages_from_config()
-    # Reverse languages but not versions, because we take version-language
-    # pairs from the end of the list, effectively reversing it.
-    # This runs languages in config.toml order and versions newest first.
-    todo = [
-        (version, language)
-        for version in Version.filter(versions, args.branch)
-        for language in reversed(Language.filter(languages, args.languages))
-    ]
+    # This runs versions newest first and languages in config.toml order.
+    versions_to_build = Version.filter(versions, args.branch)[::-1]
+    languages_to_build = Language.filter(languages, args.languages)
     del args.branch
     del args.languages
-    all_built_successfully = True
+    workers = args.workers
+    del args.workers
     cpython_repo = Repository(
         "https://github.com/python/cpython.git",
         args.build_root / _checkout_name(args.select_output),
     )
-    while todo:
-        version, language = todo.pop()
-        logging.root.handlers[0].setFormatter(
-            logging.Formatter(
-                f"%(asctime)s %(levelname)s {language.tag}/{version.name}: %(message)s"
-            )
-        )
-        if sentry_sdk:
-            scope = sentry_sdk.get_isolation_scope()
-            scope.set_tag("version", version.name)
-            scope.set_tag("language", language.tag)
-            cpython_repo.update()
-        builder = DocBuilder(
-            version, versions, language, languages, cpython_repo, **vars(args)
-        )
-        all_built_successfully &= builder.run(http)
-    logging.root.handlers[0].setFormatter(
-        logging.Formatter("%(asctime)s %(levelname)s: %(message)s")
-    )
+    cpython_repo.update()
+    states = load_states(_state_file(args.build_root, args.select_output))
+    purger = SurrogateKeyPurger(http)
+    purger.start()
+
+    def build_version(version: Version) -> bool:
+        """Build all languages of a version, in its own worktree if in parallel."""
+        if workers > 1:
+            worktree_name = f"{_checkout_name(args.select_output)}-{version.name}"
+            repo = cpython_repo.add_worktree(args.build_root / worktree_name)
+        else:
+            repo = cpython_repo
+        built_successfully = True
+        for language in languages_to_build:
+            # Sequential builds run in the main thread: don't let the
+            # next log records be prefixed with the last build.
+            token = current_build.set(f"{language.tag}/{version.name}")
+            try:
+                if sentry_sdk:
+                    scope = sentry_sdk.get_isolation_scope()
+                    scope.set_tag("version", version.name)
+                    scope.set_tag("language", language.tag)
+                builder = DocBuilder(
+                    version,
+                    versions,
+                    language,
+                    languages,
+                    repo,
+                    **vars(args),
+                    purger=purger,
+                    states=states,
+                )
+                built_successfully &= builder.run()
+            finally:
+                current_build.reset(token)
+        return built_successfully
+
+    all_built_successfully = True
+    if workers == 1:
+        # In the main thread, so Ctrl-C stops the build right away.
+        for version in versions_to_build:
+            all_built_successfully &= build_version(version)
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {
+                executor.submit(build_version, version): version
+                for version in versions_to_build
+            }
+            for future in as_completed(futures):
+                try:
+                    built_successfully = future.result()
+                except Exception as err:
+                    # Like a worktree that can't be added: other versions go on.
+                    logging.exception("Failed building %s.", futures[future].name)
+                    if sentry_sdk:
+                        sentry_sdk.capture_exception(err)
+                    built_successfully = False
+                all_built_successfully &= built_successfully
+        except KeyboardInterrupt:
+            # Don't wait for all the queued versions to be built.
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+    purger.close()
 
     build_sitemap(versions, languages, args.www_root, args.group)
     build_404(args.www_root, args.group)
@@ -1236,7 +1735,12 @@ def build_docs(args) -> bool:
         args.skip_cache_invalidation,
         http,
     )
-    proofread_canonicals(args.www_root, args.skip_cache_invalidation, http)
+    proofread_canonicals(
+        args.www_root,
+        _canonical_index_file(args.build_root, args.select_output),
+        args.skip_cache_invalidation,
+        http,
+    )
 
     logging.info("Full build done (%s).", format_seconds(perf_counter() - start_time))
 
@@ -1249,6 +1753,30 @@ def _checkout_name(select_output: str | None) -> str:
     return "cpython"
 
 
+def _state_file(build_root: Path, select_output: str | None) -> Path:
+    if select_output is not None:
+        return build_root / f"state-{select_output}.toml"
+    return build_root / "state.toml"
+
+
+def _canonical_index_file(build_root: Path, select_output: str | None) -> Path:
+    if select_output is not None:
+        return build_root / f"canonical-index-{select_output}.json"
+    return build_root / "canonical-index.json"
+
+
+def load_states(state_file: Path) -> dict:
+    """Load the rebuild states of all builds, keyed by "/language/version/".
+
+    The file is only read once per run: builders then look up and update
+    this same dict, see DocBuilder.load_state and DocBuilder.save_state.
+    """
+    try:
+        return tomllib.loads(state_file.read_text(encoding="UTF-8"))
+    except FileNotFoundError:
+        return {}
+
+
 def main():
     """Script entry point."""
     args = parse_args()
@@ -1265,16 +1793,14 @@ def main():
 
 
 def build_docs_with_lock(args: Namespace, lockfile_name: str) -> int:
-    try:
-        lock = zc.lockfile.LockFile(HERE / lockfile_name)
-    except zc.lockfile.LockError:
-        logging.info("Another builder is running... dying...")
-        return EX_FAILURE
-
-    try:
+    with open(HERE / lockfile_name, "a", encoding="UTF-8") as lockfile:
+        try:
+            fcntl.flock(lockfile, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            logging.info("Another builder is running... dying...")
+            return EX_FAILURE
+        # The lock is released when the file gets closed.
         return EX_OK if build_docs(args) else EX_FAILURE
-    finally:
-        lock.close()
 
 
 if __name__ == "__main__":
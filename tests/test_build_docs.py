@@ -1,6 +1,16 @@
+from pathlib import Path
+import subprocess
+
 import pytest
 
-from build_docs import format_seconds
+from build_docs import (
+    Repository,
+    fix_canonical,
+    format_seconds,
+    iter_html,
+    rsync_changed_files,
+    surrogate_key_of,
+)
 
 
 @pytest.mark.parametrize(
@@ -24,3 +34,141 @@ from build_docs import format_seconds
 )
 def test_format_seconds(seconds: float, expected: str) -> None:
     assert format_seconds(seconds) == expected
+
+
+def test_iter_html(tmp_path) -> None:
+    for name in "index.html", "library/os.html", "archives/index.html":
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).touch()
+    (tmp_path / "_sources" / "index.rst.txt").parent.mkdir()
+    (tmp_path / "_sources" / "index.rst.txt").touch()
+    (tmp_path / "3").symlink_to("library")
+
+    found = sorted(path.relative_to(tmp_path) for path in iter_html(tmp_path))
+
+    assert [str(path) for path in found] == ["index.html", "library/os.html"]
+
+
+def test_iter_html_missing_directory(tmp_path) -> None:
+    assert list(iter_html(tmp_path / "missing")) == []
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("3.13/whatsnew/3.13.html", "en/3.13"),
+        ("fr/3.13/library/os.html", "fr/3.13"),
+        ("pt-br/3.12/index.html", "pt-br/3.12"),
+        ("robots.txt", None),
+        ("fr/index.html", None),
+    ],
+)
+def test_surrogate_key_of(path: str, expected: str | None) -> None:
+    assert surrogate_key_of(Path(path)) == expected
+
+
+def test_rsync_changed_files() -> None:
+    itemized = "\n".join(
+        [
+            ".d..t...... ./",
+            ">f+++++++++ library/new.html",
+            ">f.st...... index.html",
+            "cd+++++++++ whatsnew/",
+            "*deleting   library/gone.html",
+            "*deleting   old/",
+            "rsync: [sender] some warning",
+            "",
+        ]
+    )
+
+    assert rsync_changed_files(itemized) == [
+        "library/new.html",
+        "index.html",
+        "library/gone.html",
+    ]
+
+
+PAGE = """<html><head>
+<link rel="canonical" href="https://docs.python.org/3/library/os.html" />
+</head><body></body></html>"""
+
+
+def test_fix_canonical_removes_broken_link(tmp_path) -> None:
+    page = tmp_path / "3.13" / "library" / "os.html"
+    page.parent.mkdir(parents=True)
+    page.write_text(PAGE)
+    page.chmod(0o664)
+
+    assert fix_canonical(tmp_path, page) == ("3/library/os.html", True)
+    assert page.read_text() == "<html><head>\n\n</head><body></body></html>"
+    assert page.stat().st_mode & 0o777 == 0o664
+    assert [path.name for path in page.parent.iterdir()] == ["os.html"]
+    # Running again, like a concurrent builder would, changes nothing.
+    assert fix_canonical(tmp_path, page) == (None, False)
+    assert page.read_text() == "<html><head>\n\n</head><body></body></html>"
+
+
+def test_fix_canonical_keeps_valid_link(tmp_path) -> None:
+    page = tmp_path / "3" / "library" / "os.html"
+    page.parent.mkdir(parents=True)
+    page.write_text(PAGE)
+
+    assert fix_canonical(tmp_path, page) == ("3/library/os.html", False)
+    assert page.read_text() == PAGE
+
+
+def test_fix_canonical_empty_file(tmp_path) -> None:
+    page = tmp_path / "index.html"
+    page.touch()
+
+    assert fix_canonical(tmp_path, page) == (None, False)
+    assert page.read_bytes() == b""
+
+
+def git(directory: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", directory, "-c", "user.name=Test", "-c", "user.email=t@t"]
+        + list(args),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repository(tmp_path) -> Repository:
+    """A clone, with a commit for each branch and tag of its remote."""
+    upstream = tmp_path / "upstream"
+    upstream.mkdir()
+    git(upstream, "init", "--quiet")
+    for name in "branch", "lightweight", "annotated", "tag", "same":
+        git(upstream, "commit", "--quiet", "--allow-empty", "--message", name)
+    git(upstream, "branch", "3.13", "HEAD~4")
+    git(upstream, "tag", "v3.13.1", "HEAD~3")
+    git(upstream, "tag", "--annotate", "--message=v3.13.2", "v3.13.2", "HEAD~2")
+    git(upstream, "tag", "3.12", "HEAD~1")
+    git(upstream, "branch", "3.12", "HEAD")
+    git(tmp_path, "clone", "--quiet", upstream, "clone")
+    return Repository(str(upstream), tmp_path / "clone")
+
+
+@pytest.mark.parametrize(
+    "pattern, message",
+    [
+        ("3.13", "branch"),
+        ("v3.13.1", "lightweight"),
+        ("v3.13.2", "annotated"),
+        ("3.12", "same"),  # The branch wins over the tag.
+    ],
+)
+def test_repository_get_ref(repository: Repository, pattern, message) -> None:
+    commit = repository.get_ref(pattern)
+
+    assert git(repository.directory, "log", "-1", "--format=%s", commit) == message
+    assert git(repository.directory, "cat-file", "-t", commit) == "commit"
+
+
+def test_repository_switch(repository: Repository) -> None:
+    repository.switch("v3.13.2")
+
+    assert repository.head() == git(repository.directory, "rev-parse", "HEAD")